@@ -2,14 +2,82 @@
 import os
 import re
 import json
-import requests
 import sys
+import time
+import functools
+import asyncio
+import aiohttp
+import ijson
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
-from datetime import datetime
+from datetime import datetime, time as dt_time
 
+# Responses smaller than this (in bytes on the wire) are decoded in one go
+# with orjson; larger or unsized ones are stream-parsed to bound memory use
+STREAM_PARSE_THRESHOLD = 1 << 20
 
-def fetch_reddit_data(url):
-    """Fetch JSON data from a Reddit URL."""
+# Query parameters sent with every comment listing request
+COMMENT_QUERY = "limit=500&raw_json=1"
+
+# Reddit's morechildren endpoint accepts at most 100 comment IDs per call
+MORE_CHILDREN_BATCH = 100
+
+# How many posts are fetched and exported at the same time in a batch
+MAX_CONCURRENT_EXPORTS = 5
+
+# Transient failures are retried with exponential backoff (1s, 2s, 4s)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Every time of day as formatted in dates, indexed by minute of the day
+TIMES_OF_DAY = [
+    dt_time(hour, minute).strftime("%I:%M %p")
+    for hour in range(24)
+    for minute in range(60)
+]
+
+# Placeholder Reddit uses for removed authors and bodies
+DELETED = sys.intern("[deleted]")
+
+# Patterns used to name output files
+POST_ID_RE = re.compile(r"comments/([a-z0-9]+)/", re.IGNORECASE)
+SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+SLUG_DASH_RE = re.compile(r"[\s-]+")
+
+# The ASCII characters SLUG_STRIP_RE removes, for a single bytes.translate pass
+SLUG_STRIP_BYTES = bytes(c for c in range(128) if SLUG_STRIP_RE.match(chr(c)))
+
+
+class RateLimiter:
+    """Space out requests and back off when Reddit's rate limit runs low."""
+
+    def __init__(self, requests_per_minute=60):
+        self.interval = 60 / requests_per_minute
+        self.next_request = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        """Wait until the next request is allowed to go out."""
+        async with self.lock:
+            now = time.monotonic()
+            if self.next_request > now:
+                await asyncio.sleep(self.next_request - now)
+            self.next_request = max(now, self.next_request) + self.interval
+
+    def update(self, headers):
+        """Read Reddit's rate limit headers and pause before the quota runs out."""
+        remaining = float(headers.get("X-Ratelimit-Remaining", 60))
+        reset = float(headers.get("X-Ratelimit-Reset", 60))
+
+        # Hold back every pending request until the window resets
+        if remaining < 2:
+            self.next_request = max(self.next_request, time.monotonic() + reset)
+
+
+async def fetch_reddit_data(url, session, limiter):
+    """Fetch JSON data from a Reddit URL using a shared aiohttp session."""
     # Normalize the URL - make sure it has a scheme
     if not url.startswith(("http://", "https://")):
         url = "https://" + url
@@ -28,32 +96,171 @@ def fetch_reddit_data(url):
         raise ValueError("Invalid Reddit URL")
 
     # Add .json if not already present
-    if not url.endswith(".json"):
-        url = url + ".json"
+    path = parsed_url.path
+    if not path.endswith(".json"):
+        path = path + ".json"
+
+    # Ask for up to 500 comments per page so fewer end up as "more" stubs.
+    # raw_json=1 returns text without Reddit's legacy HTML escaping (&amp; etc.)
+    query = parsed_url.query
+    query = f"{query}&{COMMENT_QUERY}" if query else COMMENT_QUERY
+    url = parsed_url._replace(path=path, query=query).geturl()
+
+    post_data, comments, total_count, more = await fetch_with_retries(
+        session, url, limiter, read_reddit_response
+    )
+
+    # Fill in the comments Reddit collapsed into "more" stubs
+    expand_error = None
+    if post_data and more and "name" in post_data:
+        api_url = parsed_url._replace(
+            path="/api/morechildren.json", query="", fragment=""
+        )
+        added, expand_error = await expand_more_comments(
+            session, limiter, api_url.geturl(), post_data["name"], more
+        )
+        total_count += added
 
-    # Make request with proper user agent
-    headers = {"User-agent": "Reddit Comment Exporter 1.0"}
+    return post_data, comments, total_count, original_url, expand_error
 
-    try:
-        response = requests.get(url, headers=headers)
 
-        # Check for rate limiting
-        if response.status_code == 429:
-            print("Error: Reddit rate limit exceeded. Please try again later.")
-            sys.exit(1)
+async def fetch_with_retries(session, url, limiter, read_response, params=None):
+    """GET a Reddit URL, retrying transient failures, and parse the response."""
+    for attempt in range(MAX_RETRIES + 1):
+        await limiter.wait()
 
-        # Check for other errors
-        response.raise_for_status()
+        try:
+            async with session.get(url, params=params) as response:
+                # Slow down ahead of the limit instead of failing on a 429
+                limiter.update(response.headers)
 
-        return response.json(), original_url
+                if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    return await read_response(response)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == MAX_RETRIES:
+                raise
 
-    except requests.exceptions.RequestException as e:
-        print(f"Network error: {str(e)}")
-        sys.exit(1)
+        # Back off exponentially before retrying a failed request
+        await asyncio.sleep(RETRY_BACKOFF * 2**attempt)
 
 
-def process_comments(comments_data, depth=0):
-    """Recursively process comments and their replies."""
+def check_response(response):
+    """Raise an error if Reddit did not return a successful response."""
+    # Check for rate limiting
+    if response.status == 429:
+        raise aiohttp.ClientError("Reddit rate limit exceeded. Please try again later.")
+
+    # Check for other errors
+    response.raise_for_status()
+
+
+async def read_reddit_response(response):
+    """Parse the post, its comments and any "more" stubs out of a thread response."""
+    check_response(response)
+    more = []
+
+    # Small responses are fastest to decode whole with orjson's C parser
+    if (
+        response.content_length is not None
+        and response.content_length < STREAM_PARSE_THRESHOLD
+    ):
+        data = orjson.loads(await response.read())
+        if not data or len(data) < 2:
+            return None, [], 0, more
+
+        post_data = data[0]["data"]["children"][0]["data"]
+        comments, total_count = process_comments(data[1], more=more)
+        return post_data, comments, total_count, more
+
+    # Otherwise stream-parse the response: the post listing comes first, then
+    # the comment listing. Each top-level comment is processed as soon as it
+    # is parsed, so the raw JSON tree is never held in memory all at once.
+    post_data = None
+    comments = []
+    total_count = 0
+    async for child in ijson.items(
+        response.content, "item.data.children.item", use_float=True
+    ):
+        if child["kind"] == "t3":  # 't3' is the prefix for posts
+            post_data = child["data"]
+        else:
+            total_count += process_children([child], comments, more=more)
+
+    return post_data, comments, total_count, more
+
+
+async def read_more_children(response):
+    """Return the comments and stubs in a morechildren response."""
+    check_response(response)
+    data = orjson.loads(await response.read())
+    if not isinstance(data, dict):
+        raise ValueError("Unexpected morechildren response from Reddit")
+    return data.get("json", {}).get("data", {}).get("things", [])
+
+
+async def expand_more_comments(session, limiter, api_url, link_id, more):
+    """Fetch comments hidden behind "more" stubs into the tree.
+
+    Returns how many comments were added, and the error that stopped the
+    expansion early or None.
+    """
+    # IDs from every stub are requested together, up to 100 per call, rather
+    # than one request per stub; IDs are never requested twice
+    requested = set()
+    added = 0
+    try:
+        while more:
+            # Remember where the comments under each parent belong in the tree
+            targets = {}
+            ids = []
+            for parent_id, children, output, depth in more:
+                targets[parent_id] = (output, depth)
+                ids.extend(child for child in children if child not in requested)
+            requested.update(ids)
+            more = []
+
+            for start in range(0, len(ids), MORE_CHILDREN_BATCH):
+                params = {
+                    "api_type": "json",
+                    "link_id": link_id,
+                    "children": ",".join(ids[start : start + MORE_CHILDREN_BATCH]),
+                    "raw_json": 1,
+                }
+                things = await fetch_with_retries(
+                    session, api_url, limiter, read_more_children, params
+                )
+
+                # Things come back as a flat list with parents before their replies
+                for thing in things:
+                    thing_data = thing["data"]
+                    target = targets.get(thing_data.get("parent_id"))
+                    if target is None:
+                        continue
+
+                    output, depth = target
+                    if thing["kind"] == "t1":
+                        comment = build_comment(thing_data, depth)
+                        output.append(comment)
+                        targets[thing_data["name"]] = (comment.replies, depth + 1)
+                        added += 1
+                    elif thing["kind"] == "more" and thing_data.get("children"):
+                        more.append(
+                            (
+                                thing_data["parent_id"],
+                                thing_data["children"],
+                                output,
+                                depth,
+                            )
+                        )
+    except Exception as e:
+        # The stubs are optional, so keep whatever was added before the failure
+        return added, e
+
+    return added, None
+
+
+def process_comments(comments_data, depth=0, more=None):
+    """Process a comment listing and its replies, returning them and their count."""
     processed_comments = []
 
     # Handle empty or invalid comments
@@ -62,240 +269,387 @@ def process_comments(comments_data, depth=0):
         or not isinstance(comments_data, dict)
         or "data" not in comments_data
     ):
-        return processed_comments
-
-    for comment in comments_data["data"]["children"]:
-        # Skip "more" comments (collapsed threads)
-        if comment["kind"] == "more":
-            continue
+        return processed_comments, 0
+
+    count = process_children(
+        comments_data["data"]["children"], processed_comments, depth, more
+    )
+    return processed_comments, count
+
+
+class Comment:
+    """A processed comment and its replies."""
+
+    # Slots instead of a per-comment dict keep large threads compact in memory
+    __slots__ = ("author", "body", "score", "created_utc", "depth", "replies")
+
+    def __init__(self, author, body, score, created_utc, depth):
+        self.author = author
+        self.body = body
+        self.score = score
+        self.created_utc = created_utc
+        self.depth = depth
+        self.replies = []
+
+
+def build_comment(comment_data, depth):
+    """Create a comment object from Reddit's data for a single comment."""
+    return Comment(
+        # Authors repeat heavily, so interning shares one string per author
+        sys.intern(comment_data.get("author", DELETED)),
+        comment_data.get("body", DELETED),
+        comment_data.get("score", 0),
+        comment_data.get("created_utc"),
+        depth,
+    )
+
+
+def process_children(children, output, depth=0, more=None):
+    """Process listing children and their replies into output, returning the count."""
+    # "more" stubs are recorded in the more list, when given, as
+    # (parent_id, comment_ids, output_list, depth) so they can be expanded later.
+    # Comments are counted here so the tree need not be walked again later.
+
+    # Each stack entry holds some children, the list they go into and their depth
+    stack = [(children, output, depth)]
+    count = 0
+    while stack:
+        children, output, level = stack.pop()
+
+        for comment in children:
+            # Record "more" stubs (collapsed threads) so they can be expanded
+            if comment["kind"] == "more":
+                more_data = comment["data"]
+                if more is not None and more_data.get("children"):
+                    more.append(
+                        (more_data["parent_id"], more_data["children"], output, level)
+                    )
+                continue
+
+            if comment["kind"] != "t1":  # 't1' is the prefix for comments
+                continue
 
-        if comment["kind"] == "t1":  # 't1' is the prefix for comments
             comment_data = comment["data"]
 
             # Create comment object
-            processed_comment = {
-                "author": comment_data.get("author", "[deleted]"),
-                "body": comment_data.get("body", "[deleted]"),
-                "score": comment_data.get("score", 0),
-                "created_utc": comment_data.get("created_utc"),
-                "depth": depth,
-                "replies": [],
-            }
-
-            # Process replies if they exist
-            if (
-                "replies" in comment_data
-                and comment_data["replies"]
-                and isinstance(comment_data["replies"], dict)
-            ):
-                processed_comment["replies"] = process_comments(
-                    comment_data["replies"], depth + 1
+            processed_comment = build_comment(comment_data, level)
+            output.append(processed_comment)
+            count += 1
+
+            # Queue replies if they exist
+            replies = comment_data.get("replies")
+            if replies and isinstance(replies, dict) and "data" in replies:
+                stack.append(
+                    (
+                        replies["data"]["children"],
+                        processed_comment.replies,
+                        level + 1,
+                    )
                 )
 
-            processed_comments.append(processed_comment)
-
-    return processed_comments
+    return count
 
 
 def format_timestamp(timestamp):
     """Convert Unix timestamp to human-readable date format."""
     if not timestamp:
         return "Unknown date"
-    dt = datetime.fromtimestamp(timestamp)
-    return dt.strftime("%B %d, %Y at %I:%M %p")
+    # Dates are shown to the minute, so many comments share one cached string
+    return format_minute(int(timestamp // 60))
+
+
+@functools.lru_cache(maxsize=8192)
+def format_minute(minute):
+    """Convert a Unix timestamp in whole minutes to human-readable date format."""
+    dt = datetime.fromtimestamp(minute * 60)
+    # Only the date part needs strftime; the time of day comes from a table
+    return format_day(dt.date()) + TIMES_OF_DAY[dt.hour * 60 + dt.minute]
+
+
+@functools.lru_cache(maxsize=1024)
+def format_day(day):
+    """Format the date part of a timestamp, cached per day."""
+    return day.strftime("%B %d, %Y at ")
 
 
-def format_comment(comment, is_top_level=False):
+@functools.lru_cache(maxsize=4096)
+def format_author(author):
+    """Format a username as a link to its profile, cached per author."""
+    if author != DELETED:
+        return f"[u/{author}](https://www.reddit.com/user/{author})"
+    return f"u/{author}"
+
+
+def format_comment(comment, fh, is_top_level=False):
     """Format a comment preserving original formatting and making usernames into links."""
     # Custom instruction test: Python function generated!
-    author = comment["author"]
-    score = comment["score"]
-    body = comment["body"]
-    depth = comment["depth"]
-    created_utc = comment.get("created_utc")
+    author = comment.author
+    score = comment.score
+    body = comment.body
+    depth = comment.depth
+    created_utc = comment.created_utc
 
     # Format date if available
     date_str = format_timestamp(created_utc) if created_utc else ""
 
-    markdown = ""  # Ensure markdown is always defined
-
+    # Markdown fragments are written straight to fh instead of being returned
     # Top level comments have no indentation
     if is_top_level or depth == 0:
         # Format the comment header with username as link
-        if author != "[deleted]":
-            markdown = f"**[u/{author}](https://www.reddit.com/user/{author})** · {score} points · {date_str}\n\n"
-        else:
-            markdown = f"**u/{author}** · {score} points · {date_str}\n\n"
+        fh.write(f"**{format_author(author)}** · {score} points · {date_str}\n\n")
 
         # Format the body text (preserve original formatting)
-        markdown += f"{body}\n\n"
+        fh.write(f"{body}\n\n")
 
         # Add replies as block quotes
-        for reply in comment["replies"]:
-            reply_text = format_nested_reply(reply)
-            markdown += reply_text
+        for reply in comment.replies:
+            format_nested_reply(reply, 1, fh)
 
         # Add separator between top-level comments
-        markdown += "---\n\n"
+        fh.write("---\n\n")
 
-    return markdown
 
+def format_nested_reply(comment, depth, fh):
+    """Write a nested reply and its replies to fh as block quotes, one per depth."""
+    # Each stack entry is a reply and its depth, or None and the depth of the
+    # quote line that closes a reply's block once its own replies are written
+    stack = [(comment, depth)]
+    while stack:
+        comment, depth = stack.pop()
 
-def format_nested_reply(comment):
-    """Format a nested reply using block quotes."""
-    author = comment["author"]
-    score = comment["score"]
-    body = comment["body"]
-    created_utc = comment.get("created_utc")
+        # Quote every line once at its final depth instead of re-quoting child output
+        quote = ">" * depth
+        if comment is None:
+            fh.write(f"{quote}\n")
+            continue
 
-    # Format date if available
-    date_str = format_timestamp(created_utc) if created_utc else ""
+        author = comment.author
+        score = comment.score
+        body = comment.body
+        created_utc = comment.created_utc
 
-    # Format with block quotes
-    markdown = "> "
+        # Format date if available
+        date_str = format_timestamp(created_utc) if created_utc else ""
 
-    # Format the comment header with username as link
-    if author != "[deleted]":
-        markdown += f"**[u/{author}](https://www.reddit.com/user/{author})** · {score} points · {date_str}\n>\n"
-    else:
-        markdown += f"**u/{author}** · {score} points · {date_str}\n>\n"
+        prefix = f"{quote} "
 
-    # Format the body with block quotes (preserve original formatting)
-    body_lines = body.split("\n")
-    formatted_body = "\n".join([f"> {line}" for line in body_lines])
-    markdown += f"{formatted_body}\n>\n"
+        # Format the comment header with username as link
+        fh.write(
+            f"{prefix}**{format_author(author)}** · {score} points · {date_str}\n{quote}\n"
+        )
 
-    # Process replies with deeper nesting
-    for reply in comment["replies"]:
-        # Increase the quote level for deeper nesting
-        nested_reply = format_nested_reply(reply)
-        nested_lines = nested_reply.split("\n")
-        deeper_nested = "\n".join([f">{line}" for line in nested_lines])
-        markdown += f"{deeper_nested}\n"
+        # Format the body with block quotes (preserve original formatting)
+        # A single replace quotes every line without building a list of lines
+        quoted_body = body.replace("\n", f"\n{prefix}")
+        fh.write(f"{prefix}{quoted_body}\n{quote}\n")
 
-    return markdown
+        # Queue replies with deeper nesting, in reverse so they pop in order,
+        # each followed by a closing quote line at this depth
+        for reply in reversed(comment.replies):
+            stack.append((None, depth))
+            stack.append((reply, depth + 1))
 
 
-def generate_markdown(post_data, comments, original_url):
-    """Generate markdown from post data and comments."""
+def generate_markdown_stream(post_data, comments, original_url, fh):
+    """Write markdown for post data and comments to an open file handle."""
     # Add title
-    markdown = f"# {post_data.get('title', 'Untitled Post')}\n\n"
+    fh.write(f"# {post_data.get('title', 'Untitled Post')}\n\n")
 
     # Add link to original Reddit post
-    markdown += f"[Original Reddit Post]({original_url})\n\n"
+    fh.write(f"[Original Reddit Post]({original_url})\n\n")
 
     # Add author info, score and post date
-    author = post_data.get("author", "[deleted]")
+    author = post_data.get("author", DELETED)
     score = post_data.get("score", 0)
     created_utc = post_data.get("created_utc")
     date_str = format_timestamp(created_utc) if created_utc else "Unknown date"
 
-    if author != "[deleted]":
-        markdown += f"**Posted by [u/{author}](https://www.reddit.com/user/{author})** · {score} points · {date_str}\n\n"
-    else:
-        markdown += f"**Posted by u/{author}** · {score} points · {date_str}\n\n"
+    fh.write(f"**Posted by {format_author(author)}** · {score} points · {date_str}\n\n")
 
     # Add post content if available (preserving formatting)
     selftext = post_data.get("selftext", "")
     if selftext:
-        markdown += f"{selftext}\n\n"
+        fh.write(f"{selftext}\n\n")
 
-    markdown += "---\n\n"
+    fh.write("---\n\n")
 
     # Add comments section if there are comments
     if comments:
-        markdown += f"## Comments ({len(comments)} top-level comments)\n\n"
+        fh.write(f"## Comments ({len(comments)} top-level comments)\n\n")
 
         # Process each top-level comment
         for comment in comments:
-            markdown += format_comment(comment, is_top_level=True)
+            format_comment(comment, fh, is_top_level=True)
     else:
-        markdown += "## Comments\n\nNo comments found.\n\n"
-
-    return markdown
-
+        fh.write("## Comments\n\nNo comments found.\n\n")
 
-def count_all_comments(comments):
-    """Count total number of comments including replies."""
-    total = len(comments)
-    for comment in comments:
-        total += count_all_comments(comment["replies"])
-    return total
 
+def export_post(reddit_url, result, output_dir, label=None):
+    """Write the markdown export for a single fetched Reddit post, returning success."""
+    # Messages name the URL, or where it was read from when a label is given
+    label = label or reddit_url
 
-def main():
-    """Main function to execute the script."""
-    # Set output directory to ./output
-    output_dir = "./output"
-
-    # Create output directory if it doesn't exist
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        print(f"Created output directory: {output_dir}")
+    try:
+        # Re-raise errors from the fetch so they are reported here
+        if isinstance(result, Exception):
+            raise result
 
-    # Prompt for Reddit URL
-    reddit_url = input("Enter Reddit URL: ")
+        post_data, comments, total_count, original_url, expand_error = result
 
-    try:
         # Extract post ID from URL for file naming consistency
-        post_id_match = re.search(r"comments/([a-z0-9]+)/", reddit_url, re.IGNORECASE)
+        post_id_match = POST_ID_RE.search(reddit_url)
         if not post_id_match:
-            print("Warning: Could not extract post ID from URL, using generic filename")
+            print(
+                f"Warning: Could not extract post ID from {label}, "
+                "using generic filename"
+            )
             extracted_post_id = "unknown"
         else:
             extracted_post_id = post_id_match.group(1)
 
-        # Fetch data
-        data, original_url = fetch_reddit_data(reddit_url)
+        # Check that the post itself was found in the response
+        if post_data is None:
+            print(f"Error: Invalid data format received from Reddit for {label}.")
+            return False
 
-        # Extract post data
-        if not data or len(data) < 2:
-            print("Error: Invalid data format received from Reddit.")
-            sys.exit(1)
+        if expand_error is not None:
+            print(
+                f"Warning: Could not expand collapsed comments for {label}: "
+                f"{expand_error}"
+            )
 
-        post_data = data[0]["data"]["children"][0]["data"]
-
-        # Process comments
-        comments_data = data[1]
-        comments = process_comments(comments_data)
-
-        # Get comment counts
+        # Get comment counts; the total was tallied while processing
         top_level_count = len(comments)
-        total_count = count_all_comments(comments)
-
-        # Generate markdown
-        markdown = generate_markdown(post_data, comments, original_url)
 
         # Create filename from post ID (for consistency) and title
         post_id = extracted_post_id  # Use extracted ID for consistency
         title = post_data.get("title", "untitled")
-        title_slug = re.sub(r"[^\w\s-]", "", title).strip().lower()
-        title_slug = re.sub(r"[\s-]+", "-", title_slug)
+        # ASCII titles, the common case, skip the regex engine for stripping
+        if title.isascii():
+            title_slug = title.encode("ascii").translate(None, SLUG_STRIP_BYTES)
+            title_slug = title_slug.decode("ascii").strip().lower()
+        else:
+            title_slug = SLUG_STRIP_RE.sub("", title).strip().lower()
+        title_slug = SLUG_DASH_RE.sub("-", title_slug)
         filename = f"{post_id}-{title_slug}.md"
         filepath = os.path.join(output_dir, filename)
 
-        # Check if file already exists
+        # Check if file already exists; each message is a single print so
+        # lines from posts exported on other threads cannot split it
         if os.path.exists(filepath):
-            print(f"File already exists: {output_dir}/{filename}")
-            print("Overwriting existing file...")
+            print(
+                f"File already exists: {output_dir}/{filename}\n"
+                "Overwriting existing file..."
+            )
 
-        # Write markdown to file (overwriting if it exists)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(markdown)
+        # Stream markdown to file (overwriting if it exists); the 1 MiB
+        # buffer batches the many small fragment writes into few syscalls
+        with open(filepath, "w", encoding="utf-8", buffering=1 << 20) as f:
+            generate_markdown_stream(post_data, comments, original_url, f)
 
-        print(f"Comments exported to {output_dir}/{filename}")
         print(
-            f"Processed {top_level_count} top-level comments and {total_count} total comments."
+            f"Comments exported to {output_dir}/{filename}\n"
+            f"Processed {top_level_count} top-level comments and {total_count} total comments for {label}."
         )
+        return True
 
+    except aiohttp.ClientError as e:
+        print(f"Network error for {label}: {str(e)}")
     except ValueError as e:
-        print(f"Value error: {str(e)}")
+        print(f"Value error for {label}: {str(e)}")
     except Exception as e:
-        print(f"Error: {str(e)}")
+        print(f"Error for {label}: {str(e)}")
         import traceback
 
         traceback.print_exc()
 
+    return False
+
+
+async def fetch_and_export(
+    reddit_url, label, session, limiter, semaphore, pool, output_dir
+):
+    """Fetch one Reddit URL, then export it on a worker thread, returning success."""
+    # Only a few posts are in flight at once, which also bounds how many
+    # comment trees are held in memory together
+    async with semaphore:
+        try:
+            result = await fetch_reddit_data(reddit_url, session, limiter)
+        except Exception as e:
+            result = e
+
+        # Render and write in the pool so other fetches keep running meanwhile
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            pool, export_post, reddit_url, result, output_dir, label
+        )
+
+
+async def export_all(urls, output_dir):
+    """Fetch and export several Reddit URLs concurrently, returning each success."""
+    # Make requests with proper user agent
+    headers = {"User-agent": "Reddit Comment Exporter 1.0"}
+    limiter = RateLimiter()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_EXPORTS)
+
+    # Bound connecting and each read rather than the whole download, so large
+    # threads are not cut off while they are still streaming in
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=30)
+
+    # One session keeps connections alive across requests; aiohttp asks for
+    # gzip-compressed responses and decompresses them by default
+    with ThreadPoolExecutor() as pool:
+        async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+            return await asyncio.gather(
+                *[
+                    fetch_and_export(
+                        url, label, session, limiter, semaphore, pool, output_dir
+                    )
+                    for url, label in urls
+                ]
+            )
+
+
+def read_urls(args):
+    """Collect Reddit URLs from arguments, expanding files that list one per line."""
+    # Each URL comes with a label for messages; URLs read from a file are
+    # labelled with the file and line they came from
+    urls = []
+    for arg in args:
+        if os.path.isfile(arg):
+            with open(arg, encoding="utf-8") as f:
+                for line_number, line in enumerate(f, start=1):
+                    url = line.strip()
+                    if url:
+                        urls.append((url, f"{url} ({arg}:{line_number})"))
+        else:
+            urls.append((arg, arg))
+    return urls
+
+
+def main():
+    """Main function to execute the script."""
+    # Set output directory to ./output
+    output_dir = "./output"
+
+    # Create output directory if it doesn't exist
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"Created output directory: {output_dir}")
+
+    # Take Reddit URLs from the command line, or prompt for one
+    reddit_urls = read_urls(sys.argv[1:])
+    if not reddit_urls:
+        reddit_url = input("Enter Reddit URL: ")
+        reddit_urls = [(reddit_url, reddit_url)]
+
+    # Fetch all posts concurrently, exporting each as soon as it arrives
+    results = asyncio.run(export_all(reddit_urls, output_dir))
+
+    # Exit with an error status if any export failed
+    if not all(results):
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()